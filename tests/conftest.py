@@ -236,9 +236,9 @@ def microvm_image_fetcher():
 
 
 @pytest.fixture(
-    params=microvm_image_fetcher().list_microvm_images(
+    params=sorted(microvm_image_fetcher().list_microvm_images(
         capability_filter=['*']
-    )
+    ))
 )
 def test_microvm_any(request, microvm, microvm_image_fetcher):
     """Yield a microvm that can have any image in the spec bucket.
@@ -261,9 +261,9 @@ def test_microvm_any(request, microvm, microvm_image_fetcher):
 
 TEST_MICROVM_CAP_FIXTURE_TEMPLATE = (
     "@pytest.fixture("
-    "    params=microvm_image_fetcher().list_microvm_images(\n"
+    "    params=sorted(microvm_image_fetcher().list_microvm_images(\n"
     "        capability_filter=['CAP']\n"
-    "    )\n"
+    "    ))\n"
     ")\n"
     "def test_microvm_with_CAP(request, microvm, microvm_image_fetcher):\n"
     "    microvm_image_fetcher.get_microvm_image(\n"
@@ -124,7 +124,10 @@ class JailerContext:
         jailed_p = os.path.join("/", file_name)
 
         if create:
-            cmd = 'ln -f {} {}'.format(file_path, global_p)
+            # -L dereferences symlinked resources (e.g. a kernel file
+            # symlinked into the slot), as a link to the symlink itself
+            # would dangle inside the chroot.
+            cmd = 'ln -fL {} {}'.format(file_path, global_p)
             run(cmd, shell=True, check=True)
             cmd = 'chown {}:{} {}'.format(self.uid, self.gid, global_p)
             run(cmd, shell=True, check=True)
@@ -2,15 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 """Define a class for interacting with microvm images in s3."""
 
+import concurrent.futures
+import json
 import os
-import re
 
+from collections import defaultdict
 from shutil import copyfile
 from typing import List
 
 import boto3
 import botocore.client
 
+from boto3.s3.transfer import TransferConfig
+
 
 class MicrovmImageS3Fetcher:
     """A borg class for fetching Firecracker microvm images from s3.
@@ -43,6 +47,11 @@ class MicrovmImageS3Fetcher:
     TagSet = [{"key": "capability:<cap_name>", "value": ""}, ...]
     ```
 
+    Alternatively, a folder can encode its capability set directly in its
+    name, e.g. `<microvm_image_folder_n>__cap-net,cap-vsock/`. This saves
+    one tagging round-trip per image when mapping the bucket; the s3 tags
+    are only consulted for folders whose name encodes no capabilities.
+
     # Credentials
 
     When run on an EC2 instance, `boto3` will check for IMDS credentials if no
@@ -61,7 +70,25 @@ class MicrovmImageS3Fetcher:
 
     ENV_LOCAL_IMAGES_PATH_VAR = 'OPT_LOCAL_IMAGES_PATH'
 
+    MICROVM_IMAGE_MAP_CACHE_RELPATH = '.microvm_image_map.json'
+    MICROVM_IMAGE_MAP_CACHE_VERSION = 2
+    """Bumped whenever the shape of the cached bucket map changes."""
+
+    RESOURCE_KIND_OTHER = 0
+    RESOURCE_KIND_KERNEL = 1
+    RESOURCE_KIND_ROOTFS = 2
+    RESOURCE_KIND_SSH_KEY = 3
+    RESOURCE_KIND_DIR = 4
+    """Resource kinds, classified once per resource while mapping."""
+
     CAPABILITY_KEY_PREFIX = 'capability:'
+    CAPABILITY_KEY_PREFIX_LEN = len(CAPABILITY_KEY_PREFIX)
+
+    CAPABILITY_NAME_SEPARATOR = '__'
+    CAPABILITY_NAME_TOKEN_PREFIX = 'cap-'
+
+    CAP_BLOOM_MASK = 2**16 - 1
+    """Bit-position mask for the capability bloom filter."""
 
     __shared_state = {}
     """Initializing the shared state here leads to all objects sharing it.
@@ -78,6 +105,23 @@ class MicrovmImageS3Fetcher:
     microvm_images = None
     microvm_images_by_cap = None
 
+    _existing_local_paths = None
+    """Memoizes positive `os.path.exists` checks on cached resources.
+
+    The downloader is the only writer to those paths, so once a resource
+    is known to exist locally, repeated fetches can skip the stat
+    syscall.
+    """
+
+    _cap_bloom = None
+    """Bloom filter over all known capability names; see map_bucket()."""
+
+    _list_microvm_images_cache = None
+    """Memoized `list_microvm_images` results, keyed by sorted filter.
+
+    Reset whenever the bucket is remapped.
+    """
+
     def __init__(
         self,
         microvm_images_bucket
@@ -93,6 +137,9 @@ class MicrovmImageS3Fetcher:
 
         self.microvm_images_bucket = microvm_images_bucket
 
+        if self._existing_local_paths is None:
+            self._existing_local_paths = set()
+
         # The Borg pattern ensures that the map_bucket() is called only once
         # per test session.
         if self.microvm_images is None:
@@ -105,7 +152,75 @@ class MicrovmImageS3Fetcher:
         Assumes the correct microvm image structure, and copies all
         microvm image resources into the microvm resource path.
         """
-        for resource_key in self.microvm_images[microvm_image_name]:
+        # These are invariant across the resource loop, so compute them
+        # once per call instead of once per resource.
+        image_rel_path = os.path.join(
+            self.MICROVM_IMAGES_RELPATH,
+            microvm_image_name
+        )
+
+        if self.ENV_LOCAL_IMAGES_PATH_VAR in os.environ:
+            # There's a user-managed local microvm image directory.
+            resource_root_path = (
+                os.environ.get(self.ENV_LOCAL_IMAGES_PATH_VAR)
+            )
+        else:
+            # Use a root path in the temporary test session directory.
+            resource_root_path = microvm.path
+
+        # Local root of this image's resources. Used for downloading
+        # resources only once.
+        local_image_path = os.path.join(resource_root_path, image_rel_path)
+
+        slot_dirs, microvm_resources, pending_downloads = (
+            self._plan_image_fetch(
+                microvm_image_name,
+                microvm.path,
+                image_rel_path,
+                local_image_path
+            )
+        )
+
+        # Create every directory the slot and the pending downloads need
+        # in one deduplicated, sorted sweep instead of a mkdir/makedirs
+        # call per resource. Sorting guarantees parents are created
+        # before their children.
+        needed_dirs = slot_dirs.union(
+            os.path.dirname(resource_local_path)
+            for _, resource_local_path in pending_downloads
+        )
+        for dir_path in sorted(needed_dirs):
+            os.makedirs(dir_path, exist_ok=True)
+
+        self._download_resources(pending_downloads)
+
+        for resource_kind, resource_local_path, microvm_dest_path \
+                in microvm_resources:
+            self._install_resource_into_slot(
+                microvm,
+                resource_kind,
+                resource_local_path,
+                microvm_dest_path
+            )
+
+    def _plan_image_fetch(
+        self,
+        microvm_image_name,
+        microvm_path,
+        image_rel_path,
+        local_image_path
+    ):
+        """Walk an image's resource list and plan the fetch work.
+
+        Returns a tuple of the slot directories to create, the
+        `(kind, local path, slot path)` triples to install, and the
+        `(s3 key, local path)` pairs still pending download.
+        """
+        slot_dirs = set()
+        microvm_resources = []
+        pending_downloads = []
+        for resource_key, resource_kind \
+                in self.microvm_images[microvm_image_name]:
             if resource_key in [
                 self.MICROVM_IMAGE_KERNEL_RELPATH,
                 self.MICROVM_IMAGE_BLOCKDEV_RELPATH
@@ -114,78 +229,171 @@ class MicrovmImageS3Fetcher:
                 # allocated resources.
                 continue
 
-            microvm_dest_path = os.path.join(microvm.path, resource_key)
+            microvm_dest_path = os.path.join(microvm_path, resource_key)
 
-            if resource_key.endswith('/'):
-                # Create a new microvm_directory if one is encountered.
-                os.mkdir(microvm_dest_path)
+            if resource_kind == self.RESOURCE_KIND_DIR:
+                # New microvm directories are created in one sweep by the
+                # caller.
+                slot_dirs.add(microvm_dest_path)
                 continue
 
-            image_rel_path = os.path.join(
-                self.MICROVM_IMAGES_RELPATH,
-                microvm_image_name
+            # Relative path of a microvm resource within a microvm directory,
+            # and its local counterpart. The roots are precomputed by the
+            # caller, so each is a single concatenation.
+            resource_rel_path = f'{image_rel_path}/{resource_key}'
+            resource_local_path = f'{local_image_path}/{resource_key}'
+
+            if resource_local_path not in self._existing_local_paths:
+                if os.path.exists(resource_local_path):
+                    self._existing_local_paths.add(resource_local_path)
+                else:
+                    # Locally download an s3 resource the first time we
+                    # encounter it.
+                    pending_downloads.append(
+                        (resource_rel_path, resource_local_path)
+                    )
+
+            microvm_resources.append(
+                (resource_kind, resource_local_path, microvm_dest_path)
             )
 
-            # Relative path of a microvm resource within a microvm directory.
-            resource_rel_path = os.path.join(
-                image_rel_path,
-                resource_key
-            )
+        return slot_dirs, microvm_resources, pending_downloads
 
-            if self.ENV_LOCAL_IMAGES_PATH_VAR in os.environ:
-                # There's a user-managed local microvm image directory.
-                resource_root_path = (
-                    os.environ.get(self.ENV_LOCAL_IMAGES_PATH_VAR)
-                )
-            else:
-                # Use a root path in the temporary test session directory.
-                resource_root_path = microvm.path
-
-            # Local path of a microvm resource. Used for downloading resources
-            # only once.
-            resource_local_path = os.path.join(
-                resource_root_path,
-                resource_rel_path
-            )
+    def _download_resources(self, pending_downloads):
+        """Download the given `(s3 key, local path)` pairs from s3.
 
-            if not os.path.exists(resource_local_path):
-                # Locally create / download an s3 resource the first time we
-                # encounter it.
-                os.makedirs(
-                    os.path.dirname(resource_local_path),
-                    exist_ok=True
-                )
-                self.s3.download_file(
+        Fetching many small image files is dominated by per-request
+        latency rather than bandwidth, so the downloads are issued
+        concurrently over the client's connection pool.
+        """
+        if not pending_downloads:
+            return
+
+        transfer_config = TransferConfig(max_concurrency=16)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=16
+        ) as executor:
+            downloads = [
+                executor.submit(
+                    self.s3.download_file,
                     self.microvm_images_bucket,
                     resource_rel_path,
-                    resource_local_path)
+                    resource_local_path,
+                    Config=transfer_config
+                )
+                for resource_rel_path, resource_local_path
+                in pending_downloads
+            ]
+            for download in downloads:
+                download.result()
+
+        self._existing_local_paths.update(
+            resource_local_path
+            for _, resource_local_path in pending_downloads
+        )
 
-            if not os.path.exists(microvm_dest_path):
-                copyfile(resource_local_path, microvm_dest_path)
+    def _install_resource_into_slot(
+        self,
+        microvm,
+        resource_kind,
+        resource_local_path,
+        microvm_dest_path
+    ):
+        """Install a downloaded resource into a microvm slot.
 
-            if resource_key.endswith(self.MICROVM_IMAGE_KERNEL_FILE_SUFFIX):
-                microvm.kernel_file = microvm_dest_path
+        Links or copies the cached resource to its slot destination, and
+        wires kernel / rootfs / ssh key paths up on the microvm.
+        """
+        is_read_only = resource_kind in (
+            self.RESOURCE_KIND_KERNEL,
+            self.RESOURCE_KIND_SSH_KEY
+        )
 
-            if resource_key.endswith(self.MICROVM_IMAGE_ROOTFS_FILE_SUFFIX):
-                microvm.rootfs_file = microvm_dest_path
+        if not os.path.exists(microvm_dest_path):
+            if is_read_only:
+                # These are read-only from the slot's perspective, so
+                # the slot can share the cached copy's data blocks.
+                self._link_resource_into_slot(
+                    resource_local_path,
+                    microvm_dest_path
+                )
+            else:
+                # The guest may write into fs files through a block
+                # device, so each slot gets a private copy.
+                copyfile(resource_local_path, microvm_dest_path)
 
-            if resource_key.endswith(self.MICROVM_IMAGE_SSH_KEY_SUFFIX):
-                # Add the key path to the config dictionary and set
-                # permissions.
-                microvm.ssh_config['ssh_key_path'] = microvm_dest_path
-                os.chmod(microvm_dest_path, 400)
+        if resource_kind == self.RESOURCE_KIND_KERNEL:
+            microvm.kernel_file = microvm_dest_path
+        elif resource_kind == self.RESOURCE_KIND_ROOTFS:
+            microvm.rootfs_file = microvm_dest_path
+        elif resource_kind == self.RESOURCE_KIND_SSH_KEY:
+            # Add the key path to the config dictionary and set
+            # permissions.
+            microvm.ssh_config['ssh_key_path'] = microvm_dest_path
+            os.chmod(microvm_dest_path, 0o400)
+
+    @staticmethod
+    def _link_resource_into_slot(resource_local_path, microvm_dest_path):
+        """Symlink a cached read-only resource into a microvm slot.
+
+        A symlink is a single syscall and copies zero bytes, and unlike a
+        hardlink it also works across filesystems. Falls back to a
+        hardlink, then to a full copy, on filesystems where symlinks are
+        not available.
+        """
+        try:
+            os.symlink(
+                os.path.abspath(resource_local_path),
+                microvm_dest_path
+            )
+        except OSError:
+            try:
+                os.link(resource_local_path, microvm_dest_path)
+            except OSError:
+                copyfile(resource_local_path, microvm_dest_path)
 
     def list_microvm_images(self, capability_filter: List[str] = None):
-        """Return microvm images with the specified capabilities."""
-        capability_filter = capability_filter or ['*']
-        microvm_images_with_caps = []
-        for cap in capability_filter:
-            if cap == '*':
-                microvm_images_with_caps.append({*self.microvm_images})
-                continue
-            microvm_images_with_caps.append(self.microvm_images_by_cap[cap])
+        """Return the set of microvm images with the given capabilities.
 
-        return list(set.intersection(*microvm_images_with_caps))
+        The result is a read-only, set-like iterable rather than a list;
+        callers needing ordering or indexing materialize it themselves, so
+        callers that only iterate pay no list-build cost.
+        """
+        # '*' matches every image, which makes it a no-op inside an
+        # intersection, so drop it rather than copying every image name
+        # into a fresh set.
+        caps = [cap for cap in capability_filter or [] if cap != '*']
+        if not caps:
+            # No capability filtering, so every image matches.
+            return self.microvm_images.keys()
+
+        # A capability that no image has (e.g. a typo in a test) is
+        # rejected by a few bit ops on the bloom filter, without touching
+        # the capability dict at all.
+        for cap in caps:
+            cap_bits = self._cap_bloom_bits(cap)
+            if cap_bits & self._cap_bloom != cap_bits:
+                return frozenset()
+
+        # The capability sets are frozen once `map_bucket` completes, so
+        # intersection results can be memoized across calls.
+        cache_key = tuple(sorted(caps))
+        images = self._list_microvm_images_cache.get(cache_key)
+        if images is None:
+            # Intersecting starting from the smallest set means the
+            # probing loop iterates the fewest candidate elements. Bloom
+            # filter false positives land on the empty default and yield
+            # an empty intersection.
+            sets = sorted(
+                (
+                    self.microvm_images_by_cap.get(cap, frozenset())
+                    for cap in caps
+                ),
+                key=len
+            )
+            images = sets[0].intersection(*sets[1:])
+            self._list_microvm_images_cache[cache_key] = images
+        return images
 
     def enum_capabilities(self):
         """Return a list of all the capabilities of all microvm images."""
@@ -197,38 +405,233 @@ class MicrovmImageS3Fetcher:
         This allows the other methods to work on local objects.
 
         Populates `self.microvm_images` with
-        {microvm_image_folder_key_n: [microvm_image_key_n, ...], ...}
+        {microvm_image_folder_key_n:
+         [(microvm_image_key_n, resource_kind_n), ...], ...}
+        where the resource kind is one of the `RESOURCE_KIND_*` constants,
+        classified once here so fetching images is a plain dispatch.
 
         Populates `self.microvm_images_by_cap` with a capability dict:
         `{capability_n: {microvm_image_folder_key_n, ...}, ...}
+
+        When a user-managed local image directory is configured via
+        `ENV_LOCAL_IMAGES_PATH_VAR`, the mapping is also cached there as
+        JSON, so that later test session processes can skip the cold-start
+        bucket scan as long as the bucket sentinel is unchanged.
         """
+        self._list_microvm_images_cache = {}
+        cache_path = None
+        sentinel = None
+        if self.ENV_LOCAL_IMAGES_PATH_VAR in os.environ:
+            cache_path = os.path.join(
+                os.environ.get(self.ENV_LOCAL_IMAGES_PATH_VAR),
+                self.MICROVM_IMAGE_MAP_CACHE_RELPATH
+            )
+            sentinel = self._bucket_sentinel()
+
+        if sentinel and os.path.exists(cache_path):
+            if self._load_bucket_map_cache(cache_path, sentinel):
+                return
+
         self.microvm_images = {}
-        self.microvm_images_by_cap = {}
-        folder_key_groups_regex = re.compile(
-            self.MICROVM_IMAGES_RELPATH + r'(.+?)/(.*)'
+        # A defaultdict makes inserting a capability a single lookup; the
+        # freeze below converts it back to a plain dict.
+        self.microvm_images_by_cap = defaultdict(set)
+
+        # A single `list_objects_v2` call returns at most 1000 keys, silently
+        # truncating larger buckets. The paginator transparently follows
+        # continuation tokens, so all keys are enumerated in one pass.
+        paginator = self.s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.microvm_images_bucket,
+            Prefix=self.MICROVM_IMAGES_RELPATH,
+            PaginationConfig={'PageSize': 1000}
         )
 
-        for obj in self.s3.list_objects_v2(
+        microvm_image_root_keys = self._walk_bucket_keys(pages)
+
+        # Folders that encode no capabilities in their name fall back to
+        # s3 tagging. Each `get_object_tagging` call is an independent
+        # round-trip to s3, so overlap them across a thread pool instead
+        # of paying one round-trip latency per microvm image. `boto3`
+        # clients are thread-safe.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+            all_caps = list(executor.map(
+                self.get_caps,
+                [key for _, key in microvm_image_root_keys]
+            ))
+
+        for (microvm_image_name, _), caps in zip(
+            microvm_image_root_keys,
+            all_caps
+        ):
+            for cap in caps:
+                self.microvm_images_by_cap[cap].add(microvm_image_name)
+
+        # The capability sets are only mutated while mapping; freeze them
+        # so they are safe to hand out and to cache intersections of.
+        self.microvm_images_by_cap = {
+            cap: frozenset(microvm_image_names)
+            for cap, microvm_image_names
+            in self.microvm_images_by_cap.items()
+        }
+        self._build_cap_bloom()
+
+        if sentinel:
+            self._store_bucket_map_cache(cache_path, sentinel)
+
+    def _walk_bucket_keys(self, pages):
+        """Classify every listed bucket key into the image map.
+
+        Every listed key starts with the requested prefix, so a plain
+        prefix strip plus a single-scan partition on the first '/' does
+        the job of the old key regex without the regex engine.
+
+        Returns the `(name, key)` pairs of the root folders whose names
+        encode no capabilities, for which the s3 tags are authoritative.
+        """
+        prefix_len = len(self.MICROVM_IMAGES_RELPATH)
+
+        microvm_image_root_keys = []
+        for page in pages:
+            for obj in page.get('Contents', []):
+                remainder = obj['Key'][prefix_len:]
+                microvm_image_name, sep, resource = remainder.partition('/')
+                if not sep or not microvm_image_name:
+                    # Ignore files (leaves) under MICROVM_IMAGES_RELPATH
+                    continue
+
+                if not resource:
+                    # This is a microvm image root folder.
+                    self.microvm_images[microvm_image_name] = []
+                    caps = self._parse_caps_from_name(microvm_image_name)
+                    if caps:
+                        for cap in caps:
+                            self.microvm_images_by_cap[cap].add(
+                                microvm_image_name
+                            )
+                    else:
+                        microvm_image_root_keys.append(
+                            (microvm_image_name, obj['Key'])
+                        )
+                else:
+                    # This is key within a microvm image root folder.
+                    self.microvm_images[microvm_image_name].append(
+                        (resource, self._classify_resource(resource))
+                    )
+
+        return microvm_image_root_keys
+
+    def _parse_caps_from_name(self, microvm_image_name):
+        """Return the set of capabilities encoded in an image folder name.
+
+        Returns an empty set for names that encode none, in which case
+        the folder's s3 tags are authoritative.
+        """
+        _, sep, caps_token = microvm_image_name.rpartition(
+            self.CAPABILITY_NAME_SEPARATOR
+        )
+        if not sep:
+            return set()
+        return {
+            token[len(self.CAPABILITY_NAME_TOKEN_PREFIX):]
+            for token in caps_token.split(',')
+            if token.startswith(self.CAPABILITY_NAME_TOKEN_PREFIX)
+        }
+
+    def _cap_bloom_bits(self, cap):
+        """Return the bloom filter bits for a capability name.
+
+        Two bit positions are derived from two hashes of the name, as
+        usual for bloom filters, to keep the false positive rate low.
+        """
+        return (
+            1 << (hash(cap) & self.CAP_BLOOM_MASK)
+            | 1 << (hash(cap + '\x00') & self.CAP_BLOOM_MASK)
+        )
+
+    def _build_cap_bloom(self):
+        """(Re)build the bloom filter over all known capabilities."""
+        cap_bloom = 0
+        for cap in self.microvm_images_by_cap:
+            cap_bloom |= self._cap_bloom_bits(cap)
+        self._cap_bloom = cap_bloom
+
+    def _classify_resource(self, resource):
+        """Return the `RESOURCE_KIND_*` constant for a resource key."""
+        if resource.endswith('/'):
+            return self.RESOURCE_KIND_DIR
+        if resource.endswith(self.MICROVM_IMAGE_KERNEL_FILE_SUFFIX):
+            return self.RESOURCE_KIND_KERNEL
+        if resource.endswith(self.MICROVM_IMAGE_ROOTFS_FILE_SUFFIX):
+            return self.RESOURCE_KIND_ROOTFS
+        if resource.endswith(self.MICROVM_IMAGE_SSH_KEY_SUFFIX):
+            return self.RESOURCE_KIND_SSH_KEY
+        return self.RESOURCE_KIND_OTHER
+
+    def _bucket_sentinel(self):
+        """Return a cheap token tracking changes to the image bucket.
+
+        This is a single `MaxKeys=1` list call, as opposed to the full
+        bucket scan done by `map_bucket`. It is a heuristic: reuploading a
+        key other than the first one under the images prefix goes
+        undetected, in which case the cache file needs to be deleted by
+        hand. Returns `None` if no sentinel could be obtained.
+        """
+        contents = self.s3.list_objects_v2(
             Bucket=self.microvm_images_bucket,
-            Prefix=self.MICROVM_IMAGES_RELPATH
-        )['Contents']:
-            key_groups = re.match(folder_key_groups_regex, obj['Key'])
-            if key_groups is None:
-                # Ignore files (leaves) under MICROVM_IMAGES_RELPATH
-                continue
-            microvm_image_name = key_groups.group(1)
-            resource = key_groups.group(2)
-
-            if not resource:
-                # This is a microvm image root folder.
-                self.microvm_images[microvm_image_name] = []
-                for cap in self.get_caps(obj['Key']):
-                    if cap not in self.microvm_images_by_cap:
-                        self.microvm_images_by_cap[cap] = set()
-                    self.microvm_images_by_cap[cap].add(microvm_image_name)
-            else:
-                # This is key within a microvm image root folder.
-                self.microvm_images[microvm_image_name].append(resource)
+            Prefix=self.MICROVM_IMAGES_RELPATH,
+            MaxKeys=1
+        ).get('Contents', [])
+        if not contents:
+            return None
+        return [contents[0]['Key'], contents[0]['ETag']]
+
+    def _load_bucket_map_cache(self, cache_path, sentinel):
+        """Restore the bucket map from a local json cache file.
+
+        Returns `True` iff the cache was valid for the given sentinel.
+        """
+        try:
+            with open(cache_path, encoding='utf-8') as cache_file:
+                cached_map = json.load(cache_file)
+            if cached_map['version'] != self.MICROVM_IMAGE_MAP_CACHE_VERSION:
+                return False
+            if cached_map['sentinel'] != sentinel:
+                return False
+            # json stores the (resource, kind) tuples as 2-element lists,
+            # which unpack just the same, so no conversion is needed.
+            microvm_images = cached_map['microvm_images']
+            microvm_images_by_cap = {
+                cap: frozenset(microvm_image_names)
+                for cap, microvm_image_names
+                in cached_map['microvm_images_by_cap'].items()
+            }
+        except (OSError, ValueError, KeyError):
+            # An unreadable, corrupt, or incomplete cache file is treated
+            # as a miss.
+            return False
+        self.microvm_images = microvm_images
+        self.microvm_images_by_cap = microvm_images_by_cap
+        self._build_cap_bloom()
+        return True
+
+    def _store_bucket_map_cache(self, cache_path, sentinel):
+        """Persist the bucket map to a local json cache file."""
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(
+                {
+                    'version': self.MICROVM_IMAGE_MAP_CACHE_VERSION,
+                    'sentinel': sentinel,
+                    'microvm_images': self.microvm_images,
+                    'microvm_images_by_cap': {
+                        cap: sorted(microvm_image_names)
+                        for cap, microvm_image_names
+                        in self.microvm_images_by_cap.items()
+                    }
+                },
+                cache_file
+            )
 
     def get_caps(self, key):
         """Return the set of capabilities of an s3 object key."""
@@ -236,8 +639,12 @@ class MicrovmImageS3Fetcher:
             Bucket=self.microvm_images_bucket,
             Key=key
         )
+        # Localized to keep the comprehension tight; this runs on every
+        # thread pool worker while mapping the bucket.
+        cap_prefix = self.CAPABILITY_KEY_PREFIX
+        cap_prefix_len = self.CAPABILITY_KEY_PREFIX_LEN
         return {
-            tag['Key'][len(self.CAPABILITY_KEY_PREFIX):]
+            tag['Key'][cap_prefix_len:]
             for tag in tagging['TagSet']
-            if tag['Key'].startswith(self.CAPABILITY_KEY_PREFIX)
+            if tag['Key'].startswith(cap_prefix)
         }